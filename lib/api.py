@@ -1,7 +1,7 @@
-import requests
-from requests.adapters import HTTPAdapter
+import random
+
+import httpx
 
-from fake_useragent import UserAgent
 from typing import Dict, Literal, List, Optional, TypedDict, Union
 
 
@@ -39,22 +39,27 @@ TOCItems = List["TOCItem"]
 TOCItemsUnion = List[Union["TOCItem", "TOCMemberItem"]]
 
 
+# Curated desktop User-Agents covering each platform branch handled below.
+_UAS = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/140.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/140.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/140.0.0.0 Safari/537.36",
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64; rv:128.0) Gecko/20100101 Firefox/128.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/605.1.15 (KHTML, like Gecko) "
+    "Version/17.6 Safari/605.1.15",
+)
+
+
 def generate_browser_profile() -> Dict[str, str]:
     """Generate consistent browser headers that match a realistic User-Agent.
 
-    This is called once per process and applied to a single reusable Session,
+    This is called once per process and applied to a single reusable client,
     so we keep connections warm (HTTP keep-alive) and avoid per-request jitter.
     """
-    # fake_useragent can fail on first use without network or cached data.
-    # Fall back to a static modern Chrome UA if that happens.
-    try:
-        ua = UserAgent()
-        user_agent = ua.random
-    except Exception:
-        user_agent = (
-            "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        )
+    user_agent = random.choice(_UAS)
 
     # Parse the User-Agent to extract browser and OS info
     if "Chrome" in user_agent:
@@ -87,32 +92,29 @@ def generate_browser_profile() -> Dict[str, str]:
     }
 
 
-# A single reusable Session with connection pooling keeps requests fast.
-_SESSION: Optional[requests.Session] = None  # type: ignore[assignment]
+# A single reusable HTTP/2 client with connection pooling keeps requests fast.
+_CLIENT: Optional[httpx.Client] = None
 
 
-def _init_session() -> requests.Session:
-    """Configure and return a global requests.Session with pooling and headers.
+def _init_client() -> httpx.Client:
+    """Configure and return a global httpx.Client with pooling and headers.
 
-    - Mounts an HTTPAdapter with a larger pool size to support concurrency.
-    - Applies stable browser headers once (keep-alive, gzip, user-agent, etc.).
+    - Negotiates HTTP/2 so concurrent fetches are multiplexed over a few TLS
+      connections instead of contending for one connection per request.
+    - Pool limits sized to support concurrency (32 connections).
+    - Applies stable browser headers once (gzip/brotli, user-agent, etc.). Connections
+      are kept alive by the client; `connection` is not a valid HTTP/2 header.
+    - No default `content-type`: requests are empty POSTs, and httpx sets
+      the header itself when a `json=` body is passed.
     """
-    global _SESSION
-    if _SESSION is not None:
-        return _SESSION
-
-    s = requests.Session()
-
-    adapter = HTTPAdapter(pool_connections=32, pool_maxsize=32)
-    s.mount("https://", adapter)
-    s.mount("http://", adapter)
+    global _CLIENT
+    if _CLIENT is not None:
+        return _CLIENT
 
     base_headers = {
         "accept": "application/json, text/javascript, */*; q=0.01",
         "accept-language": "en-US,en;q=0.8",
-        "accept-encoding": "gzip, deflate",
-        "content-type": "application/json",
-        "connection": "keep-alive",
+        "accept-encoding": "gzip, br, deflate",
         "origin": "https://www.parliament.nsw.gov.au",
         "priority": "u=1, i",
         "referer": "https://www.parliament.nsw.gov.au/",
@@ -122,33 +124,42 @@ def _init_session() -> requests.Session:
         "sec-gpc": "1",
     }
     base_headers.update(generate_browser_profile())
-    s.headers.update(base_headers)
 
-    _SESSION = s
-    return s
+    _CLIENT = httpx.Client(
+        http2=True,
+        headers=base_headers,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+        timeout=httpx.Timeout(60.0),
+        follow_redirects=True,
+    )
+    return _CLIENT
 
 
-def http(url, method="GET", **kwargs):
-    """Make a request using a single pooled Session with stable headers.
+# Per-request headers for empty POSTs (the fragment/TOC fetch path). Built once
+# and passed by reference on every call; never mutated.
+_POST_EMPTY_HEADERS: Dict[str, str] = {"content-length": "0"}
+
+
+def http(url, method="GET", **kwargs) -> httpx.Response:
+    """Make a request using a single pooled HTTP/2 client with stable headers.
 
     Notes
     - No artificial per-request sleep — we are I/O-bound, so concurrency + pooling wins.
     - A `content-length: 0` header is added for empty POSTs to match the site’s expectations.
-    - Custom headers can be provided via `headers=...` and will be merged per request.
+    - Custom headers can be provided via `headers=...`; the client merges them
+      over its defaults per request.
     """
-    session = _init_session()
+    client = _init_client()
 
-    headers = kwargs.pop("headers", {}) or {}
+    headers = kwargs.pop("headers", None)
     # Handle content-length for empty body on POST
-    if method.upper() == "POST" and not kwargs.get("data") and not kwargs.get("json"):
-        headers.setdefault("content-length", "0")
-
-    if headers:
-        # Merge per-request headers over session defaults
-        request_headers = dict(session.headers)
-        request_headers.update(headers)
-    else:
-        request_headers = None
-
-    response = session.request(method, url, headers=request_headers, **kwargs)
+    if (
+        method.upper() == "POST"
+        and not kwargs.get("data")
+        and not kwargs.get("json")
+        and not kwargs.get("content")
+    ):
+        headers = {**_POST_EMPTY_HEADERS, **headers} if headers else _POST_EMPTY_HEADERS
+
+    response = client.request(method, url, headers=headers or None, **kwargs)
     return response
@@ -2,17 +2,55 @@
 
 This module provides:
 - Network fetch to retrieve fragment HTML by `docid`.
+- An on-disk cache (`cache/fragments/<docid>.html.zst`) so re-runs skip HTTP.
 - A conservative parser that extracts a minimal, structured representation
   (title/subtitle and blocks for speeches/paragraphs) for downstream use.
 """
 
-import json
+import os
+import tempfile
 import time
-from typing import Tuple
+from pathlib import Path
+from typing import Optional, Tuple
+
+import orjson
+import zstandard as zstd
 
 from .api import http
 
 
+FRAGMENT_CACHE_DIR = Path("cache") / "fragments"
+
+
+def _read_cached(path: Path) -> Optional[str]:
+    try:
+        return zstd.decompress(path.read_bytes()).decode("utf-8")
+    except (OSError, zstd.ZstdError, UnicodeDecodeError):
+        # Missing, corrupt or unreadable entry: ignore it and refetch
+        return None
+
+
+def _write_cached(path: Path, html_content: str) -> None:
+    # Best effort: a cache that can't be written must not fail the fetch
+    tmp_name: Optional[str] = None
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write to a unique temp file, then rename, so concurrent readers never
+        # see a partial file and concurrent writers never share a temp name
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False
+        ) as tmp:
+            tmp_name = tmp.name
+            tmp.write(zstd.compress(html_content.encode("utf-8")))
+        os.replace(tmp_name, path)
+    except OSError:
+        if tmp_name is not None:
+            try:
+                os.unlink(tmp_name)
+            except OSError:
+                pass
+
+
 def get_pdf_fragments(
     doc_id: str,
     *,
@@ -20,6 +58,8 @@ def get_pdf_fragments(
     retry_status_codes: Tuple[int, ...] = (502,),
     initial_delay_seconds: float = 3.0,
     backoff: float = 2.0,
+    use_cache: bool = True,
+    cache_dir: Path = FRAGMENT_CACHE_DIR,
 ) -> str:
     """Fetch Topic fragment HTML by `doc_id` and return raw HTML string.
 
@@ -28,6 +68,13 @@ def get_pdf_fragments(
       (default: 502 Bad Gateway).
     - Uses exponential backoff between attempts.
 
+    Caching:
+    - With `use_cache` (default), HTML is read from `<cache_dir>/<doc_id>.html.zst`
+      when present, and written there (zstd-compressed) after a successful fetch.
+      Pass `use_cache=False` to always hit the network (e.g. for draft days).
+    - Cache failures never fail the fetch: unreadable entries are refetched and
+      write errors are ignored.
+
     How it works:
     - Calls: POST /api/hansard/search/daily/fragment/html/{doc_id}
     - Response JSON may itself be JSON-encoded again; we decode robustly and
@@ -38,6 +85,12 @@ def get_pdf_fragments(
         "https://api.parliament.nsw.gov.au/api/hansard/search/daily/fragment/html"
     )
 
+    cache_path = cache_dir / f"{doc_id}.html.zst"
+    if use_cache:
+        cached = _read_cached(cache_path)
+        if cached is not None:
+            return cached
+
     delay = initial_delay_seconds
     attempt = 0
     while True:
@@ -57,19 +110,23 @@ def get_pdf_fragments(
         # For non-retry statuses, raise if not OK
         response.raise_for_status()
 
-        # Robustly decode possible double-encoded JSON payload
-        body = response.text
+        # Robustly decode possible double-encoded JSON payload. orjson parses the
+        # raw bytes directly, skipping the `response.text` decode step.
+        body = response.content
         if not body or not body.strip():
             raise ValueError("Empty fragment response body")
 
         try:
-            first = json.loads(body)
-        except json.JSONDecodeError:
+            first = orjson.loads(body)
+        except orjson.JSONDecodeError:
             first = response.json()
 
-        obj = json.loads(first) if isinstance(first, str) else first
+        obj = orjson.loads(first) if isinstance(first, str) else first
         # See guide/fragment.json
         html_content = obj["DocumentHtml"]
 
+        if use_cache:
+            _write_cached(cache_path, html_content)
+
         # Return raw HTML; parser selection is done upstream
         return html_content
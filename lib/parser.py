@@ -1,9 +1,12 @@
 """Parsing engines for Hansard fragments.
 
 Supported engines:
-- "bs4": BeautifulSoup with built-in html.parser
-- "bs4-lxml": BeautifulSoup with lxml parser
-- "lxml": native lxml.html (no BeautifulSoup)
+- "lxml": native lxml (no BeautifulSoup) — the production engine
+- "bs4": BeautifulSoup with built-in html.parser (benchmark-only)
+- "bs4-lxml": BeautifulSoup with lxml parser (benchmark-only)
+
+BeautifulSoup is imported lazily on first use of a bs4 engine, so production
+runs never pay for it.
 
 Provides a single entry point `parse_fragment(html, engine)` that returns the
 normalized structure used by storage writers.
@@ -11,13 +14,75 @@ normalized structure used by storage writers.
 
 from __future__ import annotations
 
-from typing import Any, Dict
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Dict, Tuple
+
+from lxml.etree import HTMLParser, XPath, fromstring as lxml_fromstring, tostring as lxml_tostring
+
+# Drops whitespace-only text and comment nodes while parsing (Hansard HTML is
+# heavily indented) and skips building the id hash table, which we never use.
+_HTML_PARSER = HTMLParser(remove_blank_text=True, remove_comments=True, collect_ids=False)
+
+# Compiled once at import; `tree.xpath(...)` would re-parse the expression per call.
+# The parenthesized `(...)[1]` form returns only the first match in document order.
+_TITLE_XPATH = XPath('(//p[contains(concat(" ", normalize-space(@class), " "), " SubDebate-H ")])[1]')
+_SUBTITLE_XPATH = XPath('(//p[contains(concat(" ", normalize-space(@class), " "), " SubSubDebate-H ")])[1]')
+
+# Class tokens checked per <p> (and its descendants) with plain set membership.
+_SPEAKER_CLASSES = frozenset({"MemberSpeech-H", "MemberUpper-H", "OfficeUpper-H"})
+_TIME_CLASS = "Time-H"
+
+# Bit flags returned by `_element_tags`.
+_TAG_SPEAKER = 1
+_TAG_TIME = 2
+
+# LRU cache of parse results keyed by (engine, html digest). Guarded by a lock
+# because `parse_fragment` may be called from several threads. `lib.storage`
+# parses in worker processes, so it consults this cache in the parent (via
+# `lookup_parse_cache`/`store_parse_cache`) before submitting any work.
+_CACHE_MAXSIZE = 512
+_CACHE: "OrderedDict[Tuple[str, bytes], Dict[str, Any]]" = OrderedDict()
+_CACHE_LOCK = threading.Lock()
+_CACHE_HITS = 0
+_CACHE_MISSES = 0
+
 
-from bs4 import BeautifulSoup
-from lxml import html as lxml_html
+# Hansard fragments reuse a handful of class attribute strings across thousands
+# of elements, so classification is memoized per raw `class` value instead of
+# splitting and building a set for every element.
+@lru_cache(maxsize=1024)
+def _element_tags(cls: str) -> int:
+    """Classify a descendant element's class string as speaker and/or time."""
+    cls_set = set(cls.split())
+    tags = 0
+    if not _SPEAKER_CLASSES.isdisjoint(cls_set):
+        tags |= _TAG_SPEAKER
+    if _TIME_CLASS in cls_set:
+        tags |= _TAG_TIME
+    return tags
+
+
+@lru_cache(maxsize=1024)
+def _paragraph_style(cls: str) -> str | None:
+    """Map a `<p>` class string to its paragraph style, or None to skip it."""
+    cls_set = set(cls.split())
+    if "NormalItalics-P" in cls_set:
+        return "NormalItalics"
+    if "NormalBold-P" in cls_set:
+        return "NormalBold"
+    if "Normal-P" in cls_set:
+        return "Normal"
+    return None
 
 
 def _parse_with_bs4(html: str, parser: str) -> Dict[str, Any]:
+    # Benchmark-only path; keep bs4 off the import-time critical path.
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html, parser)
 
     def text_or_none(el):
@@ -60,68 +125,137 @@ def _parse_with_bs4(html: str, parser: str) -> Dict[str, Any]:
 
 
 def _parse_with_lxml_native(html: str) -> Dict[str, Any]:
-    tree = lxml_html.fromstring(html)
+    tree = lxml_fromstring(html, parser=_HTML_PARSER)
+    if tree is None:
+        # Empty or whitespace-only fragment
+        return {"title": None, "subtitle": None, "blocks": []}
 
-    def has_class(el, name: str) -> bool:
-        cls = el.get("class") or ""
-        token = f" {name} "
-        return token in (" " + " ".join(cls.split()) + " ")
+    # The text serializer adds nothing at <br>; give each one a newline tail so
+    # the lines on either side don't run together.
+    for br in tree.iter("br"):
+        br.tail = "\n" + br.tail if br.tail else "\n"
 
     def text_content(el) -> str:
-        return " ".join(el.itertext()).strip()
+        # libxml2's text serializer, not a Python-level `itertext()` join. It
+        # also keeps words split across inline spans intact ("Sout"+"h").
+        return lxml_tostring(el, method="text", encoding="unicode", with_tail=False).strip()
 
     # Title and subtitle
-    title_el = tree.xpath('//p[contains(concat(" ", normalize-space(@class), " "), " SubDebate-H ")][1]')
-    subtitle_el = tree.xpath('//p[contains(concat(" ", normalize-space(@class), " "), " SubSubDebate-H ")][1]')
+    title_el = _TITLE_XPATH(tree)
+    subtitle_el = _SUBTITLE_XPATH(tree)
     title = text_content(title_el[0]) if title_el else None
     subtitle = text_content(subtitle_el[0]) if subtitle_el else None
 
     blocks: list[dict[str, Any]] = []
-    for p in tree.xpath("//p"):
-        # Detect speaker/time
-        speaker_nodes = p.xpath(
-            ".//*[contains(concat(' ', normalize-space(@class), ' '), ' MemberSpeech-H ') or "
-            "contains(concat(' ', normalize-space(@class), ' '), ' MemberUpper-H ') or "
-            "contains(concat(' ', normalize-space(@class), ' '), ' OfficeUpper-H ')]"
-        )
-        time_nodes = p.xpath(".//*[contains(concat(' ', normalize-space(@class), ' '), ' Time-H ')]")
-        if speaker_nodes:
+    for p in tree.iter("p"):
+        # Detect speaker/time in a single walk over descendant elements
+        speaker_node = None
+        time_node = None
+        for el in p.iterdescendants("*"):
+            el_cls = el.get("class")
+            if not el_cls:
+                continue
+            tags = _element_tags(el_cls)
+            if speaker_node is None and tags & _TAG_SPEAKER:
+                speaker_node = el
+            if time_node is None and tags & _TAG_TIME:
+                time_node = el
+            if speaker_node is not None and time_node is not None:
+                break
+
+        if speaker_node is not None:
             blocks.append(
                 {
                     "type": "speech",
-                    "speaker": text_content(speaker_nodes[0]),
-                    "time": text_content(time_nodes[0]) if time_nodes else None,
+                    "speaker": text_content(speaker_node),
+                    "time": text_content(time_node) if time_node is not None else None,
                     "text": text_content(p),
                 }
             )
             continue
 
         # Paragraph styles
-        if has_class(p, "Normal-P") or has_class(p, "NormalItalics-P") or has_class(p, "NormalBold-P"):
-            style = "Normal"
-            if has_class(p, "NormalItalics-P"):
-                style = "NormalItalics"
-            elif has_class(p, "NormalBold-P"):
-                style = "NormalBold"
+        style = _paragraph_style(p.get("class") or "")
+        if style is not None:
             blocks.append({"type": "paragraph", "style": style, "text": text_content(p)})
 
     return {"title": title, "subtitle": subtitle, "blocks": blocks}
 
 
-def parse_fragment(html: str, engine: str = "lxml") -> Dict[str, Any]:
+# Engine name -> parse function. Unknown engines fall back to lxml.
+_ENGINES: Dict[str, Callable[[str], Dict[str, Any]]] = {
+    "lxml": _parse_with_lxml_native,
+    "bs4": lambda html: _parse_with_bs4(html, "html.parser"),
+    "bs4-lxml": lambda html: _parse_with_bs4(html, "lxml"),
+}
+
+
+def parse_cache_key(html: str, engine: str = "lxml") -> Tuple[str, bytes]:
+    """Return the parse cache key for `html`: `(engine, blake2b(html))`."""
+    return (engine.lower(), hashlib.blake2b(html.encode("utf-8", "ignore"), digest_size=16).digest())
+
+
+def lookup_parse_cache(key: Tuple[str, bytes]) -> Dict[str, Any] | None:
+    """Return a deep copy of the cached result for `key`, or None on a miss.
+
+    Every call counts as a hit or a miss in `parse_cache_info()`.
+    """
+    global _CACHE_HITS, _CACHE_MISSES
+    with _CACHE_LOCK:
+        cached = _CACHE.get(key)
+        if cached is None:
+            _CACHE_MISSES += 1
+            return None
+        _CACHE.move_to_end(key)
+        _CACHE_HITS += 1
+    return copy.deepcopy(cached)
+
+
+def store_parse_cache(key: Tuple[str, bytes], result: Dict[str, Any]) -> None:
+    """Cache `result` under `key`. The caller must not mutate `result` afterwards."""
+    with _CACHE_LOCK:
+        _CACHE[key] = result
+        _CACHE.move_to_end(key)
+        if len(_CACHE) > _CACHE_MAXSIZE:
+            _CACHE.popitem(last=False)
+
+
+def parse_cache_info() -> Dict[str, int]:
+    """Return hit/miss counters and current size of the parse cache."""
+    with _CACHE_LOCK:
+        return {"hits": _CACHE_HITS, "misses": _CACHE_MISSES, "size": len(_CACHE)}
+
+
+def clear_parse_cache() -> None:
+    """Drop all cached parse results and reset the counters."""
+    global _CACHE_HITS, _CACHE_MISSES
+    with _CACHE_LOCK:
+        _CACHE.clear()
+        _CACHE_HITS = 0
+        _CACHE_MISSES = 0
+
+
+def parse_fragment(html: str, engine: str = "lxml", *, cache: bool = True) -> Dict[str, Any]:
     """Parse a fragment HTML string using the selected engine.
 
-    - engine = "bs4": BeautifulSoup with html.parser
-    - engine = "bs4-lxml": BeautifulSoup with lxml parser
-    - engine = "lxml": native lxml.html
+    - engine = "lxml": native lxml (production)
+    - engine = "bs4": BeautifulSoup with html.parser (benchmark-only)
+    - engine = "bs4-lxml": BeautifulSoup with lxml parser (benchmark-only)
+
+    Results are cached by `(engine, blake2b(html))` since topics on the same day
+    often share identical fragments. Callers always receive their own copy, so
+    mutating the result never affects the cache. Pass `cache=False` to bypass it
+    (e.g. when benchmarking, or inside parse worker processes).
     """
     eng = engine.lower()
-    if eng == "bs4":
-        return _parse_with_bs4(html, "html.parser")
-    if eng == "bs4-lxml":
-        return _parse_with_bs4(html, "lxml")
-    if eng == "lxml":
-        return _parse_with_lxml_native(html)
-    # Fallback to lxml
-    return _parse_with_lxml_native(html)
+    if not cache:
+        return _ENGINES.get(eng, _parse_with_lxml_native)(html)
+
+    key = parse_cache_key(html, eng)
+    cached = lookup_parse_cache(key)
+    if cached is not None:
+        return cached
 
+    result = _ENGINES.get(eng, _parse_with_lxml_native)(html)
+    store_parse_cache(key, copy.deepcopy(result))
+    return result
@@ -4,16 +4,132 @@ Creates a single large augmented TOC file per `pdfid` at `storage/<pdfid>.json`.
 Optionally displays a progress bar while fetching topic fragments.
 """
 
-import json
+import itertools
+import multiprocessing
+import os
+import sys
+import threading
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Optional, Tuple
 
-from tqdm import tqdm
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import orjson
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
 
 from .fragments import get_pdf_fragments
-from .parser import parse_fragment
-from .toc import walk_topics
+from .parser import lookup_parse_cache, parse_cache_key, parse_fragment, store_parse_cache
+from .toc import iter_topics_with_docid
+
+
+def _intern_speakers(parsed: dict) -> dict:
+    """Intern speaker names in place so each name is one str across the day.
+
+    Parse results arrive unpickled from worker processes, so any interning done
+    there is lost; it has to happen here, where the tree is kept and written.
+    """
+    for block in parsed.get("blocks") or ():
+        speaker = block.get("speaker")
+        if speaker:
+            block["speaker"] = sys.intern(speaker)
+    return parsed
+
+
+def _parse_mp_context() -> multiprocessing.context.BaseContext:
+    """Start method for the parse pool.
+
+    Its workers start lazily on the first submit, when the fetch and progress
+    threads are already running, so plain `fork` could copy held locks into
+    the child. `forkserver` (or `spawn` where unavailable) starts them from a
+    clean single-threaded process instead.
+    """
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+class _Progress:
+    """Minimal progress display: a lock-free counter plus a background printer.
+
+    `update()` only advances an `itertools.count` (atomic in CPython), so
+    completions never wait on a lock or terminal I/O. A daemon thread redraws
+    the line every `interval` seconds.
+    """
+
+    def __init__(self, total: int, desc: str, interval: float = 0.25) -> None:
+        self.total = total
+        self.desc = desc
+        self._counter = itertools.count(1)
+        self._done = 0
+        self._interval = interval
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def update(self) -> None:
+        self._done = next(self._counter)
+
+    def _render(self) -> None:
+        sys.stderr.write(f"\r{self.desc}: {self._done}/{self.total}")
+        sys.stderr.flush()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._interval):
+            self._render()
+
+    def close(self) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._render()
+        sys.stderr.write("\n")
+
+
+# Stand-in for the root's `item` list; located in the encoded root and
+# replaced by the streamed proceedings.
+_ITEM_PLACEHOLDER = "\x00item\x00"
+
+
+def _write_json_stream(path: Path, toc_root: dict, *, pretty: bool = False) -> None:
+    """Write `[toc_root]` to `path`, serializing one proceeding at a time.
+
+    The output is byte-for-byte what `orjson.dumps([toc_root])` would produce
+    (indented with `pretty`), plus a trailing newline. The root is encoded with
+    a placeholder in place of its `item` list, and each proceeding is encoded
+    and written separately where the placeholder was. That way the full
+    document is never held as a single bytes buffer.
+    """
+    option = orjson.OPT_INDENT_2 if pretty else 0
+    items = toc_root.get("item")
+    if not isinstance(items, list) or not items:
+        # Nothing to stream (missing, null or empty `item`): encode as-is
+        with path.open("wb") as f:
+            f.write(orjson.dumps([toc_root], option=option | orjson.OPT_APPEND_NEWLINE))
+        return
+
+    skeleton = orjson.dumps([{**toc_root, "item": _ITEM_PLACEHOLDER}], option=option)
+    prefix, suffix = skeleton.split(orjson.dumps(_ITEM_PLACEHOLDER), 1)
+
+    if pretty:
+        # Indent of the `"item": ...` line; list entries sit one level deeper
+        line = prefix[prefix.rfind(b"\n") + 1 :]
+        indent = line[: len(line) - len(line.lstrip(b" "))]
+        pad = indent + b"  "
+        open_list, separator, close_list = b"[\n" + pad, b",\n" + pad, b"\n" + indent + b"]"
+    else:
+        pad = b""
+        open_list, separator, close_list = b"[", b",", b"]"
+
+    with path.open("wb") as f:
+        f.write(prefix)
+        f.write(open_list)
+        for i, proceeding in enumerate(items):
+            if i:
+                f.write(separator)
+            encoded = orjson.dumps(proceeding, option=option)
+            # JSON strings never contain raw newlines, so re-indenting by line is safe
+            f.write(encoded.replace(b"\n", b"\n" + pad) if pad else encoded)
+        f.write(close_list)
+        f.write(suffix)
+        f.write(b"\n")
 
 
 def augment_all_topics_and_write(
@@ -23,57 +139,127 @@ def augment_all_topics_and_write(
     show_progress: bool = True,
     max_workers: int = 12,
     parse_engine: str = "lxml",
+    parse_workers: Optional[int] = None,
+    pretty: bool = False,
+    include_raw_html: bool = False,
+    use_cache: bool = True,
 ) -> Path:
     """Fetch fragments for all Topics concurrently and write one large file.
 
     Performance strategies implemented:
-    - Concurrency: bounded ThreadPool (default 12 workers) to overlap network I/O.
-    - Single Session pooling (in `lib.api.http`) to keep connections warm.
-    - Fast parsing: default `lxml` parser; switchable via `parse_engine` ("lxml" or "bs4").
+    - Concurrency: bounded ThreadPool (default 12 workers) to overlap network I/O,
+      fed from a sliding window of `2 * max_workers` in-flight topics.
+    - Parallel parsing: fetched HTML is parsed on a ProcessPool (default
+      `os.cpu_count()` workers) so CPU-bound parsing is not serialized by the GIL.
+    - Parse cache: identical fragments are looked up by digest in this process
+      before submitting, so repeats skip the pool entirely.
+    - Streaming output: proceedings are encoded one at a time with orjson,
+      compact by default since the file is machine-consumed (`pretty=True` to indent).
+    - On-disk fragment cache (in `lib.fragments`) so re-runs skip HTTP;
+      disable with `use_cache=False`. Draft days (`toc_root["draft"]`) never
+      read or write it, since their fragments can still change.
+    - Single HTTP/2 client pooling (in `lib.api.http`) to keep connections warm.
+    - Fast parsing: `lxml` parser. `parse_engine` accepts the bs4 engines for
+      comparison, but anything other than "lxml" is unsupported for production runs.
 
     Output:
     - Large: `storage/<pdfid>.json` containing [augmented_toc_root]
+    - Each Topic gets `data.parsed`; `data.rawHTML` is only included when
+      `include_raw_html` is set, since it roughly doubles the file size.
 
     Behavior on errors:
     - If a topic fails (e.g., 502 even after retries), we log a clear warning and continue.
     """
     # Collect all topics with a docid
-    topics: List[dict] = [
-        topic for _proc, topic in walk_topics(toc_root) if topic.get("docid")
-    ]
+    topics: List[dict] = iter_topics_with_docid(toc_root)
+    parse_workers = max(1, parse_workers) if parse_workers is not None else (os.cpu_count() or 1)
+    # Draft fragments may still be revised, and the cache has no expiry
+    use_cache = use_cache and not toc_root.get("draft")
 
-    def fetch_and_parse(topic: dict) -> Dict[str, object]:
-        docid = topic["docid"]
-        html = get_pdf_fragments(docid)
-        return {"rawHTML": html, "parsed": parse_fragment(html, engine=parse_engine)}
+    def warn(topic: dict, action: str, e: Exception) -> None:
+        topic_name = (topic.get("name") or "<unknown topic>").strip()
+        docid = topic.get("docid")
+        print(
+            f"Warning: The topic '{topic_name}' with document id '{docid}' failed to {action}. "
+            f"Error: {e}. Skipping."
+        )
 
-    pbar = (
-        tqdm(total=len(topics), desc=f"Fetching topics for {pdf_id}")
-        if show_progress
-        else None
-    )
+    pbar = _Progress(len(topics), f"Fetching topics for {pdf_id}") if show_progress else None
 
     try:
-        # Create a thread pool to fetch and parse topics concurrently
-        with ThreadPoolExecutor(max_workers=max_workers) as pool:
-            # Map futures to topics for result association
-            future_map = {pool.submit(fetch_and_parse, t): t for t in topics}
-            # As each future completes, augment the corresponding topic
-            for fut in as_completed(future_map):
-                topic = future_map[fut]
-                try:
-                    data = fut.result()
-                    topic["data"] = data
-                except Exception as e:
-                    topic_name = (topic.get("name") or "<unknown topic>").strip()
-                    docid = topic.get("docid")
-                    print(
-                        f"Warning: The topic '{topic_name}' with document id '{docid}' failed to fetch after retries. "
-                        f"Error: {e}. Skipping."
-                    )
-                finally:
-                    if pbar:
-                        pbar.update(1)
+        # Threads overlap network I/O; processes parse in parallel outside the GIL
+        with ThreadPoolExecutor(max_workers=max_workers) as fetch_pool, ProcessPoolExecutor(
+            max_workers=parse_workers, mp_context=_parse_mp_context()
+        ) as parse_pool:
+            # Sliding window: at most `window` topics are in flight (fetching or
+            # parsing) at once, so peak memory is bounded by the window size
+            # rather than the number of topics.
+            window = max_workers * 2
+            pending_topics = iter(topics)
+            fetching: Dict[Future, dict] = {}
+            parsing: Dict[Future, Tuple[dict, Optional[str], Tuple[str, bytes]]] = {}
+
+            def finish(topic: dict, html: Optional[str], parsed: dict) -> None:
+                data: Dict[str, object] = {"parsed": parsed}
+                if html is not None:
+                    data["rawHTML"] = html
+                topic["data"] = data
+                if pbar:
+                    pbar.update()
+
+            def fill_window() -> None:
+                while len(fetching) + len(parsing) < window:
+                    topic = next(pending_topics, None)
+                    if topic is None:
+                        return
+                    fetching[
+                        fetch_pool.submit(get_pdf_fragments, topic["docid"], use_cache=use_cache)
+                    ] = topic
+
+            fill_window()
+            while fetching or parsing:
+                done, _ = wait([*fetching, *parsing], return_when=FIRST_COMPLETED)
+                for fut in done:
+                    if fut in fetching:
+                        # Fetch finished: hand its HTML to the parse pool
+                        topic = fetching.pop(fut)
+                        try:
+                            html = fut.result()
+                        except Exception as e:
+                            warn(topic, "fetch after retries", e)
+                            if pbar:
+                                pbar.update()
+                            continue
+                        try:
+                            key = parse_cache_key(html, parse_engine)
+                            cached = lookup_parse_cache(key)
+                            if cached is not None:
+                                finish(topic, html if include_raw_html else None, cached)
+                                continue
+                            parse_fut = parse_pool.submit(parse_fragment, html, parse_engine, cache=False)
+                        except (BrokenProcessPool, AttributeError, TypeError) as e:
+                            # A parse worker died, or the fetch returned no HTML
+                            # string; skip this topic like any other failure
+                            warn(topic, "parse", e)
+                            if pbar:
+                                pbar.update()
+                            continue
+                        parsing[parse_fut] = (topic, html if include_raw_html else None, key)
+                        continue
+
+                    # Parse finished: augment the corresponding topic
+                    topic, html, key = parsing.pop(fut)
+                    try:
+                        parsed = fut.result()
+                    except Exception as e:
+                        warn(topic, "parse", e)
+                        if pbar:
+                            pbar.update()
+                        continue
+                    parsed = _intern_speakers(parsed)
+                    store_parse_cache(key, parsed)
+                    finish(topic, html, parsed)
+                fill_window()
     finally:
         if pbar:
             pbar.close()
@@ -83,6 +269,5 @@ def augment_all_topics_and_write(
     storage_dir.mkdir(parents=True, exist_ok=True)
 
     large_path = storage_dir / f"{pdf_id}.json"
-    with large_path.open("w", encoding="utf-8") as f:
-        json.dump([toc_root], f, ensure_ascii=False, indent=2)
+    _write_json_stream(large_path, toc_root, pretty=pretty)
     return large_path
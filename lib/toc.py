@@ -4,9 +4,10 @@ Provides functions to fetch the table of contents (TOC) for a given `pdfid`,
 and helpers to traverse or extract topics from the TOC tree.
 """
 
-import json
 from typing import Iterator, List, Optional, Tuple
 
+import orjson
+
 from .api import http, TOC, TOCItems, DocumentIDTitlePair
 
 
@@ -14,7 +15,7 @@ def get_toc(pdf_id: str) -> TOC:
     """Retrieve table of contents from API based on `pdf_id`.
 
     Endpoint: POST /api/hansard/search/daily/tableofcontentsbydate/{pdf_id}
-    The API returns a JSON string; we `json.loads` to get the list structure.
+    The API returns a JSON string; we decode it (twice if needed) with orjson.
     """
     api_base_url = "https://api.parliament.nsw.gov.au/api/hansard/search/daily/tableofcontentsbydate"
 
@@ -22,16 +23,17 @@ def get_toc(pdf_id: str) -> TOC:
     response.raise_for_status()
 
     # The API returns a JSON-encoded string; decode robustly even if content-type is odd.
-    body = response.text
+    # orjson parses the raw bytes directly, skipping the `response.text` decode step.
+    body = response.content
     if not body or not body.strip():
         raise ValueError("Empty TOC response body")
     try:
-        first = json.loads(body)
-    except json.JSONDecodeError:
-        # Fallback to requests' JSON parser if server mislabels encoding
+        first = orjson.loads(body)
+    except orjson.JSONDecodeError:
+        # Fallback to the HTTP client's JSON parser if server mislabels encoding
         first = response.json()
     # First level often returns a JSON string; decode again if needed
-    return json.loads(first) if isinstance(first, str) else first
+    return orjson.loads(first) if isinstance(first, str) else first
 
 
 def zip_toc_and_id(items: TOCItems) -> List[DocumentIDTitlePair]:
@@ -62,6 +64,21 @@ def walk_topics(toc_root: dict) -> Iterator[Tuple[dict, dict]]:
                 yield proceeding, topic
 
 
+def iter_topics_with_docid(toc_root: dict) -> List[dict]:
+    """Return every Topic that has a `docid`, in TOC order.
+
+    Same traversal as `walk_topics`, but built as a single list comprehension
+    for callers that only need the topics (not their proceedings).
+    """
+    return [
+        topic
+        for proceeding in toc_root.get("item") or []
+        if proceeding.get("type") == "Proceeding"
+        for topic in proceeding.get("item") or []
+        if topic.get("type") == "Topic" and topic.get("docid")
+    ]
+
+
 def find_topic_branch(toc_root: dict, target_docid: str) -> Optional[dict]:
     """Return a minimal tree containing only the Proceeding with the target Topic.
 
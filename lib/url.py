@@ -4,8 +4,14 @@ Functions here focus on parsing `pdfid` and `docid` from the NSW Parliament
 Hansard application URLs.
 """
 
+import re
 from typing import Tuple
 
+# `#/DateDisplay/<pdfid>[/<docid>]`, stopping each id at `/`, `?` or `#`.
+_HASH_RE = re.compile(r"#/DateDisplay/([^/?#]+)(?:/([^/?#]+))?")
+# Fallback: any path segment that looks like a pdfid, e.g. HANSARD-1323879322-159901
+_HANSARD_RE = re.compile(r"(?:^|/)(HANSARD-[^/?#]+)")
+
 
 def parse_ids_from_url(url: str) -> Tuple[str, str]:
     """Parse `pdfid` and `docid` from a Hansard URL.
@@ -17,21 +23,13 @@ def parse_ids_from_url(url: str) -> Tuple[str, str]:
     Returns a tuple of `(pdfid, docid)`. If no `docid` is present, returns an
     empty string for the second element.
     """
-    marker = "#/DateDisplay/"
-    if marker in url:
-        tail = url.split(marker, 1)[1]
-        parts = [p for p in tail.split("/") if p]
-        if len(parts) >= 2:
-            return parts[0], parts[1]
-        if len(parts) == 1:
-            # Only pdfid present after DateDisplay
-            return parts[0], ""
-
-    # Fallback: try to find a segment that looks like a pdfid
-    # Example segment pattern: HANSARD-1323879322-159901
-    segments = [p for p in url.split("/") if p]
-    for seg in reversed(segments):
-        if seg.startswith("HANSARD-"):
-            return seg, ""
+    m = _HASH_RE.search(url)
+    if m:
+        return m.group(1), m.group(2) or ""
+
+    # Fallback: use the last segment that looks like a pdfid
+    segments = _HANSARD_RE.findall(url)
+    if segments:
+        return segments[-1], ""
 
     raise ValueError("Unable to extract pdfid from URL")
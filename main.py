@@ -3,6 +3,7 @@ import argparse
 
 from lib.url import parse_ids_from_url
 from lib.toc import get_toc
+from lib.parser import parse_cache_info
 from lib.storage import augment_all_topics_and_write
 
 
@@ -10,20 +11,32 @@ def parse_args() -> argparse.Namespace:
     """Parse CLI arguments.
 
     --workers: number of parallel fetch threads to use (network I/O workers)
+    --parse-workers: number of parse processes (defaults to CPU count)
     --url: Hansard page URL; pass multiple times to process several days
     --parse-engine: parsing engine (lxml|bs4), defaults to lxml
-    --no-progress: disable tqdm progress bar
+    --no-progress: disable the progress display
+    --pretty: indent the JSON output (slower, larger file)
+    --include-raw-html: also store each topic's raw fragment HTML
+    --no-cache: ignore and don't write the on-disk fragment cache (draft days never use it)
     """
     parser = argparse.ArgumentParser(description="Legislative Assembly Hansard NSW scraper")
     parser.add_argument("--workers", type=int, default=None, help="Number of concurrent fetch workers (threads)")
+    parser.add_argument(
+        "--parse-workers", type=int, default=None, help="Number of parse worker processes (default: CPU count)"
+    )
     parser.add_argument("--url", action="append", required=True, help="Hansard URL to scrape (repeatable)")
     parser.add_argument(
         "--parse-engine",
         choices=["lxml", "bs4", "bs4-lxml"],
         default="lxml",
-        help="Parsing engine to use (lxml=native, bs4, bs4-lxml)",
+        help="Parsing engine to use (lxml=native; bs4 and bs4-lxml are for comparison only)",
     )
     parser.add_argument("--no-progress", action="store_true", help="Disable progress bar")
+    parser.add_argument(
+        "--include-raw-html", action="store_true", help="Also store each topic's raw fragment HTML (roughly doubles output size)"
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always fetch fragments; skip cache/fragments (draft days always do)")
+    parser.add_argument("--pretty", action="store_true", help="Indent the JSON output (slower, larger file)")
     return parser.parse_args()
 
 
@@ -74,14 +87,24 @@ def main():
 
         # Build the large output (entire day with data per Topic)
         print("Augmenting topics and writing outputs...")
+        # Parse cache counters are process-wide; report only this day's share
+        cache_before = parse_cache_info()
         large_path = augment_all_topics_and_write(
             pdf_id,
             toc_root,
             show_progress=not args.no_progress,
             max_workers=workers,
             parse_engine=args.parse_engine,
+            parse_workers=max(1, args.parse_workers) if args.parse_workers is not None else None,
+            pretty=args.pretty,
+            include_raw_html=args.include_raw_html,
+            use_cache=not args.no_cache,
         )
         print(f"Wrote: {large_path}")
+        cache = parse_cache_info()
+        hits = cache["hits"] - cache_before["hits"]
+        misses = cache["misses"] - cache_before["misses"]
+        print(f"Parse cache: {hits} hits, {misses} misses")
 
     print("\nDone!")
 
@@ -0,0 +1,91 @@
+import threading
+
+import orjson
+import pytest
+import zstandard as zstd
+
+import lib.fragments as fragments
+from lib.fragments import get_pdf_fragments
+
+
+HTML = '<p class="Normal-P">Hello</p>'
+
+
+class _Response:
+    status_code = 200
+
+    def __init__(self, html: str) -> None:
+        self.content = orjson.dumps(orjson.dumps({"DocumentHtml": html}).decode())
+
+    def raise_for_status(self) -> None:
+        pass
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Record network fetches; every fetch returns `HTML`."""
+    seen = []
+
+    def fake_http(url, method):
+        seen.append(url)
+        return _Response(HTML)
+
+    monkeypatch.setattr(fragments, "http", fake_http)
+    return seen
+
+
+def test_miss_fetches_and_writes_cache(tmp_path, calls):
+    assert get_pdf_fragments("D1", cache_dir=tmp_path) == HTML
+    assert len(calls) == 1
+    assert zstd.decompress((tmp_path / "D1.html.zst").read_bytes()).decode() == HTML
+    assert [p.name for p in tmp_path.iterdir()] == ["D1.html.zst"]
+
+
+def test_hit_skips_network(tmp_path, calls):
+    (tmp_path / "D1.html.zst").write_bytes(zstd.compress(b"<p>cached</p>"))
+    assert get_pdf_fragments("D1", cache_dir=tmp_path) == "<p>cached</p>"
+    assert calls == []
+
+
+def test_use_cache_false_neither_reads_nor_writes(tmp_path, calls):
+    (tmp_path / "D1.html.zst").write_bytes(zstd.compress(b"<p>cached</p>"))
+    assert get_pdf_fragments("D1", cache_dir=tmp_path, use_cache=False) == HTML
+    assert len(calls) == 1
+    assert zstd.decompress((tmp_path / "D1.html.zst").read_bytes()) == b"<p>cached</p>"
+
+
+def test_corrupt_entry_is_refetched(tmp_path, calls):
+    (tmp_path / "D1.html.zst").write_bytes(b"not zstd")
+    assert get_pdf_fragments("D1", cache_dir=tmp_path) == HTML
+    assert len(calls) == 1
+    assert zstd.decompress((tmp_path / "D1.html.zst").read_bytes()).decode() == HTML
+
+
+def test_unwritable_cache_still_returns_html(tmp_path, calls):
+    # A file where the cache directory should be makes every write fail
+    blocker = tmp_path / "cache"
+    blocker.write_text("")
+    assert get_pdf_fragments("D1", cache_dir=blocker) == HTML
+    assert len(calls) == 1
+
+
+def test_concurrent_writes_of_same_docid(tmp_path, calls, monkeypatch):
+    # Skip the read so every thread fetches and writes the same entry
+    monkeypatch.setattr(fragments, "_read_cached", lambda path: None)
+    errors = []
+
+    def fetch():
+        try:
+            get_pdf_fragments("D1", cache_dir=tmp_path)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=fetch) for _ in range(16)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert [p.name for p in tmp_path.iterdir()] == ["D1.html.zst"]
+    assert zstd.decompress((tmp_path / "D1.html.zst").read_bytes()).decode() == HTML
@@ -0,0 +1,53 @@
+import pytest
+
+import lib.parser as parser
+from lib.parser import clear_parse_cache, parse_cache_info, parse_fragment
+
+
+@pytest.fixture
+def parse_cache():
+    clear_parse_cache()
+    yield
+    clear_parse_cache()
+
+
+def _paragraph_text(html: str) -> str:
+    (block,) = parse_fragment(html, cache=False)["blocks"]
+    return block["text"]
+
+
+def test_br_separates_lines():
+    assert _paragraph_text('<p class="Normal-P">Line one<br/>Line two</p>') == "Line one\nLine two"
+
+
+def test_br_keeps_existing_tail():
+    html = '<p class="Normal-P">Line one<br/> Line two<br/></p>'
+    assert _paragraph_text(html) == "Line one\n Line two"
+
+
+def test_inline_spans_are_not_split():
+    html = '<p class="Normal-P">New Sout<span class="Normal-H">h</span> Wales</p>'
+    assert _paragraph_text(html) == "New South Wales"
+
+
+def test_parse_cache_hit_returns_private_copy(parse_cache):
+    html = '<p class="Normal-P">Hello</p>'
+    first = parse_fragment(html)
+    second = parse_fragment(html)
+    assert second == first and second is not first
+    assert parse_cache_info() == {"hits": 1, "misses": 1, "size": 1}
+
+    second["blocks"].clear()
+    assert parse_fragment(html) == first
+
+
+def test_parse_cache_evicts_least_recently_used(parse_cache, monkeypatch):
+    monkeypatch.setattr(parser, "_CACHE_MAXSIZE", 2)
+    htmls = [f'<p class="Normal-P">{i}</p>' for i in range(3)]
+    for html in htmls:
+        parse_fragment(html)
+    assert parse_cache_info()["size"] == 2
+
+    parse_fragment(htmls[0])  # evicted, so parsed again
+    parse_fragment(htmls[2])  # still cached
+    assert parse_cache_info() == {"hits": 1, "misses": 4, "size": 2}
@@ -0,0 +1,72 @@
+import copy
+import json
+
+import orjson
+import pytest
+
+import lib.storage as storage
+from lib.storage import _write_json_stream
+
+
+TOC_ROOT = {
+    "pdfid": "HANSARD-1",
+    "type": "Root",
+    "expanded": True,
+    "item": [
+        {"name": "Bills", "type": "Proceeding", "item": [{"name": "Topic", "type": "Topic", "docid": "D1"}]},
+        {"name": "Motions", "type": "Proceeding", "item": None},
+    ],
+    "draft": True,
+}
+
+
+@pytest.mark.parametrize(
+    "toc_root",
+    [
+        TOC_ROOT,
+        {"item": TOC_ROOT["item"]},  # empty header
+        {k: v for k, v in TOC_ROOT.items() if k != "item"},  # item missing
+        {**TOC_ROOT, "item": None},
+        {**TOC_ROOT, "item": []},
+    ],
+    ids=["full", "empty-header", "item-missing", "item-null", "item-empty"],
+)
+@pytest.mark.parametrize("pretty", [False, True], ids=["compact", "pretty"])
+def test_write_json_stream_round_trip(tmp_path, toc_root, pretty):
+    path = tmp_path / "out.json"
+    _write_json_stream(path, toc_root, pretty=pretty)
+
+    option = (orjson.OPT_INDENT_2 if pretty else 0) | orjson.OPT_APPEND_NEWLINE
+    assert path.read_bytes() == orjson.dumps([toc_root], option=option)
+    assert json.loads(path.read_bytes()) == [toc_root]
+
+
+@pytest.mark.parametrize("draft, expected", [(True, False), (False, True)], ids=["draft", "final"])
+def test_draft_days_bypass_fragment_cache(tmp_path, monkeypatch, draft, expected):
+    seen = []
+
+    def fake_fetch(doc_id, *, use_cache=True):
+        seen.append(use_cache)
+        return '<p class="Normal-P">Hello</p>'
+
+    monkeypatch.setattr(storage, "get_pdf_fragments", fake_fetch)
+    monkeypatch.chdir(tmp_path)
+    toc_root = {**copy.deepcopy(TOC_ROOT), "draft": draft}
+    storage.augment_all_topics_and_write("HANSARD-1", toc_root, show_progress=False, parse_workers=1)
+    assert seen == [expected]
+
+
+def test_non_string_fragment_skips_topic(tmp_path, monkeypatch, capsys):
+    toc_root = copy.deepcopy(TOC_ROOT)
+    toc_root["item"][1]["item"] = [{"name": "Empty", "type": "Topic", "docid": "D2"}]
+    fetched = {"D1": '<p class="Normal-P">Hello</p>', "D2": None}
+
+    monkeypatch.setattr(storage, "get_pdf_fragments", lambda doc_id, *, use_cache=True: fetched[doc_id])
+    monkeypatch.chdir(tmp_path)
+    path = storage.augment_all_topics_and_write("HANSARD-1", toc_root, show_progress=False, parse_workers=1)
+
+    assert "document id 'D2' failed to parse" in capsys.readouterr().out
+    (written,) = json.loads((tmp_path / path).read_bytes())
+    topic, empty = written["item"][0]["item"][0], written["item"][1]["item"][0]
+    assert topic["data"]["parsed"]["blocks"][0]["text"] == "Hello"
+    assert "data" not in empty